@@ -1,4 +1,10 @@
 from .derived import derivator
-from .remo_cmor import cmorize_variable, prepare_variable, to_cftime
+from .remo_cmor import cmorize_dataset, cmorize_variable, prepare_variable, to_cftime
 
-__all__ = ["derivator", "cmorize_variable", "prepare_variable", "to_cftime"]
+__all__ = [
+    "derivator",
+    "cmorize_dataset",
+    "cmorize_variable",
+    "prepare_variable",
+    "to_cftime",
+]
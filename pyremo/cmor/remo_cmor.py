@@ -1,5 +1,5 @@
 import datetime as dt
-import json
+import functools
 import os
 from warnings import warn
 
@@ -13,6 +13,7 @@ import xarray as xr
 # trigger download of cmor tables
 from cordex import cmor as cxcmor
 
+from ..core.utilities import bounds_and_midpoints
 from .derived import derivator
 from .utils import (
     _encode_time,
@@ -20,6 +21,7 @@ from .utils import (
     _get_cordex_pole,
     _get_pole,
     _get_varinfo,
+    _read_cmor_table,
     _strip_time_cell_method,
 )
 
@@ -81,19 +83,18 @@ def _resample_op(ds, hfreq, op, **kwargs):
 
 
 def to_cftime(date, calendar="proleptic_gregorian"):
-    if type(date) == dt.date:
-        date = dt.datetime.combine(date, dt.time())
-    elif isinstance(date, cfdt.datetime):
+    if isinstance(date, cfdt.datetime):
         # do nothing
         return date
+    # dt.date has no time attributes
     return cfdt.datetime(
         date.year,
         date.month,
         date.day,
-        date.hour,
-        date.minute,
-        date.second,
-        date.microsecond,
+        getattr(date, "hour", 0),
+        getattr(date, "minute", 0),
+        getattr(date, "second", 0),
+        getattr(date, "microsecond", 0),
         calendar=calendar,
     )
 
@@ -109,12 +110,24 @@ def _clear_time_axis(ds):
     return ds
 
 
+def _time_range(ds, freq):
+    """Left labeled timesteps of frequency ``freq`` covering the time axis of ``ds``."""
+    index = ds.indexes["time"]
+    start, end = index[[0, -1]].floor(freq)
+    if isinstance(index, xr.CFTimeIndex):
+        return xr.cftime_range(start, end, freq=freq, calendar=index.calendar)
+    return pd.date_range(start, end, freq=freq)
+
+
 def _resample(
     ds, time, time_cell_method="point", label="left", time_offset=True, **kwargs
 ):
     """Resample a variable."""
     # freq = "{}H".format(hfreq)
     if time_cell_method == "point":
+        if label == "left" and not kwargs:
+            # a single reindex is much faster than resample().nearest()
+            return ds.reindex(time=_time_range(ds, time), method="nearest")
         return ds.resample(
             time=time, label=label, **kwargs
         ).nearest()  # .interpolate("nearest") # use as_freq?
@@ -129,22 +142,30 @@ def _resample(
 
 
 def _get_bnds(values):
-    bnds = [None] * (len(values) + 1)
-    bnds[0] = values[0] - (values[1] - values[0]) / 2
-    bnds[len(values)] = values[-1] + (values[-1] - values[-2]) / 2
-    i = 1
-    while i < len(values):
-        bnds[i] = values[i] - (values[i] - values[i - 1]) / 2
-        i += 1
-    return bnds
+    """Compute cell bounds from cell centers (midpoints, extrapolated at the edges)."""
+    return bounds_and_midpoints(values)[0]
 
 
-def _crop_to_cordex_domain(ds, domain):
+@functools.lru_cache(maxsize=None)
+def _domain_bounds(domain):
+    """Returns (rlon_min, rlon_max, rlat_min, rlat_max) of a cordex domain."""
     domain = cx.cordex_domain(domain)
+    return (
+        float(domain.rlon.min()),
+        float(domain.rlon.max()),
+        float(domain.rlat.min()),
+        float(domain.rlat.max()),
+    )
+
+
+def _crop_to_cordex_domain(ds, domain):
+    rlon_min, rlon_max, rlat_min, rlat_max = _domain_bounds(domain)
     # the method=='nearest' approach does not work well with dask
-    return ds.sel(
-        rlon=slice(domain.rlon.min(), domain.rlon.max()),
-        rlat=slice(domain.rlat.min(), domain.rlat.max()),
+    # rlon and rlat are monotonically increasing, so we can find the
+    # slice bounds directly from the indexes, the same as sel does.
+    return ds.isel(
+        rlon=ds.indexes["rlon"].slice_indexer(rlon_min, rlon_max),
+        rlat=ds.indexes["rlat"].slice_indexer(rlat_min, rlat_max),
     )
 
 
@@ -233,30 +254,43 @@ def _define_time(ds, table_id, time_cell_method=None):
     return cmor.axis(
         time_axis_name,
         coord_vals=time_axis_encode,
-        # cell_bounds=_get_bnds(time_encode.to_numpy()),
+        # cell_bounds=_get_bnds(time_axis_encode),
         cell_bounds=time_bounds_encode,
         units=ds.time.encoding["units"],
     )
 
 
-def _define_grid(ds, table_ids, time_cell_method="point"):
-    cmorGrid = _define_axes(ds, table_ids[0])
-    if "time" in ds:
-        cmorTime = _define_time(ds, table_ids[1], time_cell_method)
-    else:
-        cmorTime = None
-
-    return cmorTime, cmorGrid
+def _time_blocks(da):
+    """Sizes of the dask chunks along time, None if not chunked."""
+    if da.chunks is None:
+        return None
+    return list(da.chunks[da.get_axis_num("time")])
 
 
 def _cmor_write(da, table_id, cmorTime, cmorGrid, file_name=True):
+    """Write a variable using cmor.
+
+    If ``da`` has a time axis and is chunked, data is loaded and written
+    incrementally along the dask chunks in time so that only one block is in
+    memory at a time.
+    """
     cmor.set_table(table_id)
     if cmorTime is None:
         coords = [cmorGrid]
     else:
         coords = [cmorTime, cmorGrid]
     cmor_var = cmor.variable(da.name, da.units, coords)
-    cmor.write(cmor_var, da.values)
+    blocks = None
+    if cmorTime is not None:
+        blocks = _time_blocks(da)
+    if blocks is None:
+        cmor.write(cmor_var, da.values)
+    else:
+        start = 0
+        for size in blocks:
+            block = da.isel(time=slice(start, start + size)).load()
+            cmor.write(cmor_var, block.values, ntimes_passed=size)
+            start += size
     return cmor.close(cmor_var, file_name=file_name)
 
 
@@ -267,8 +301,7 @@ def _units_convert(da, table_file):
     Maybe metpy can do this also: https://unidata.github.io/MetPy/latest/tutorials/unit_tutorial.html
 
     """
-    with open(table_file) as f:
-        table = json.load(f)
+    table = _read_cmor_table(table_file)
     units = da.units
     cf_units = table["variable_entry"][da.name]["units"]
     if units != cf_units:
@@ -460,18 +493,36 @@ def cmorize_variable(
             )
 
     """
-    ds = ds.copy()
-
-    if CORDEX_domain is None:
-        try:
-            CORDEX_domain = ds.CORDEX_domain
-        except Exception:
-            warn(
-                "could not identify CORDEX domain, try to set the 'CORDEX_domain' argument"
-            )
-    if inpath == ".":
-        inpath = os.path.dirname(cmor_table)
-
+    return cmorize_dataset(
+        ds,
+        [varname],
+        cmor_table,
+        dataset_table,
+        grids_table=grids_table,
+        inpath=inpath,
+        allow_units_convert=allow_units_convert,
+        allow_resample=allow_resample,
+        input_freq=input_freq,
+        CORDEX_domain=CORDEX_domain,
+        vertices=vertices,
+        time_units=time_units,
+        **kwargs,
+    )[0]
+
+
+def _prepare_cmor_variable(
+    ds,
+    varname,
+    cmor_table,
+    pole,
+    allow_units_convert=False,
+    allow_resample=False,
+    input_freq=None,
+    CORDEX_domain=None,
+    time_units=None,
+    **kwargs
+):
+    """Prepare a variable for cmor.write, returns the prepared dataset and cfvarinfo."""
     ds_prep = prepare_variable(ds, varname, CORDEX_domain=CORDEX_domain, **kwargs)
 
     cfvarinfo = _get_cfvarinfo(varname, cmor_table)
@@ -485,21 +536,90 @@ def cmorize_variable(
         if "time" not in ds.cf.bounds:
             warn("adding time bounds")
             ds_prep = _add_time_bounds(ds_prep)
-    # return ds_prep
+    # the pole is a scalar variable, no need for a merge
+    ds_prep[pole.name] = pole
+
+    if allow_units_convert is True:
+        ds_prep[varname] = _units_convert(ds_prep[varname], cmor_table)
+
+    return ds_prep, cfvarinfo
+
+
+def cmorize_dataset(
+    ds,
+    varnames,
+    cmor_table,
+    dataset_table,
+    grids_table=None,
+    inpath=".",
+    CORDEX_domain=None,
+    vertices=None,
+    **kwargs
+):
+    """Cmorizes several variables of a dataset.
+
+    In contrast to calling :py:func:`cmorize_variable` for each variable,
+    cmor is set up only once and the grid is defined only once for all
+    variables sharing the same horizontal coordinates.
+
+    Parameters
+    ----------
+    ds : xr.Dataset
+        REMO Dataset containing at least the variables that should be cmorized.
+    varnames: list of str
+        CF names of the variables that should be cmorized.
+    cmor_table : str
+        Filepath to cmor table.
+    dataset_table: str
+        Filepath to dataset cmor table.
+    **kwargs:
+        Further arguments, see :py:func:`cmorize_variable`.
+
+    Returns
+    -------
+    filenames
+        List of filepaths to the cmorized files.
+
+    """
+    ds = ds.copy()
+
+    if CORDEX_domain is None:
+        try:
+            CORDEX_domain = ds.CORDEX_domain
+        except Exception:
+            warn(
+                "could not identify CORDEX domain, try to set the 'CORDEX_domain' argument"
+            )
+    if inpath == ".":
+        inpath = os.path.dirname(cmor_table)
+
     pole = _get_pole(ds)
 
     if pole is None:
         warn("adding pole from archive specs: {}".format(CORDEX_domain))
         pole = _get_cordex_pole(CORDEX_domain)
-    ds_prep = xr.merge([ds_prep, pole])
-
-    if allow_units_convert is True:
-        ds_prep[varname] = _units_convert(ds_prep[varname], cmor_table)
 
     table_ids = _setup(
         dataset_table, cmor_table, grids_table=grids_table, inpath=inpath
     )
-    time_cell_method = _strip_time_cell_method(cfvarinfo)
-    cmorTime, cmorGrid = _define_grid(ds_prep, table_ids, time_cell_method)
 
-    return _cmor_write(ds_prep[varname], table_ids[1], cmorTime, cmorGrid)
+    # cmor grids by horizontal coordinates
+    grids = {}
+    filenames = []
+    for varname in varnames:
+        ds_prep, cfvarinfo = _prepare_cmor_variable(
+            ds, varname, cmor_table, pole, CORDEX_domain=CORDEX_domain, **kwargs
+        )
+        grid_key = (ds_prep.rlon.values.tobytes(), ds_prep.rlat.values.tobytes())
+        if grid_key not in grids:
+            grids[grid_key] = _define_axes(ds_prep, table_ids[0])
+        cmorGrid = grids[grid_key]
+        if "time" in ds_prep:
+            time_cell_method = _strip_time_cell_method(cfvarinfo)
+            cmorTime = _define_time(ds_prep, table_ids[1], time_cell_method)
+        else:
+            cmorTime = None
+        filenames.append(
+            _cmor_write(ds_prep[varname], table_ids[1], cmorTime, cmorGrid)
+        )
+    return filenames
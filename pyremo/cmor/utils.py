@@ -1,3 +1,4 @@
+import functools
 import json
 from warnings import warn
 
@@ -42,7 +43,9 @@ def _encode_time(time):
     return xr.conventions.encode_cf_variable(time)
 
 
+@functools.lru_cache(maxsize=None)
 def _read_cmor_table(table):
+    """Read a cmor table (cached, the returned dict should not be modified)."""
     return _read_json_file(table)
 
 
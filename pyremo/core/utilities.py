@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def horizontal_dims(da):
     """Returns the names of the horizontal dimensions."""
     for dim in da.dims:
@@ -13,3 +16,19 @@ def encode(ds, coord_fill_value=None):
     for coord in ds.coords:
         ds.coords[coord].encoding["_FillValue"] = coord_fill_value
     return ds
+
+
+def bounds_and_midpoints(values):
+    """Returns cell bounds and midpoints of a 1D array in a single pass.
+
+    The bounds are the midpoints between the values, extrapolated at both
+    ends. The midpoints are returned as a view into the bounds.
+    """
+    values = np.asarray(values)
+    bnds = np.empty(values.size + 1, dtype=np.result_type(values.dtype, 0.5))
+    mids = bnds[1:-1]
+    np.add(values[:-1], values[1:], out=mids)
+    mids *= 0.5
+    bnds[0] = values[0] - (values[1] - values[0]) / 2
+    bnds[-1] = values[-1] + (values[-1] - values[-2]) / 2
+    return bnds, mids
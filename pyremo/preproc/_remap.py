@@ -12,6 +12,7 @@ from .constants import lev_input
 from .core import (
     const,
     correct_uv,
+    deg2rad,
     geo_coords,
     geopotential,
     get_akbkem,
@@ -180,30 +181,77 @@ def remap(gds, domain_info, vc, surflib):
     # broadcast 1d global coordinates
     lamgm, phigm = broadcast_coords(gds)
 
+    # convert coordinates to radian once for all fields
+    lamem, phiem, lamgm, phigm = map(deg2rad, (lamem, phiem, lamgm, phigm))
+
     # compute remap matrix
-    indii, indjj = intersect(lamgm, phigm, lamem, phiem)  # .compute()
+    indii, indjj = intersect(lamgm, phigm, lamem, phiem, radian=True)  # .compute()
 
     # horizontal interpolation
     tge = interpolate_horizontal(
-        gds.ta, lamem, phiem, lamgm, phigm, "T", indii=indii, indjj=indjj
+        gds.ta, lamem, phiem, lamgm, phigm, "T", indii=indii, indjj=indjj, radian=True
     )
     psge = interpolate_horizontal(
-        gds.ps, lamem, phiem, lamgm, phigm, "PS", indii=indii, indjj=indjj
+        gds.ps, lamem, phiem, lamgm, phigm, "PS", indii=indii, indjj=indjj, radian=True
     )
     uge = interpolate_horizontal(
-        gds.ua, lamem, phiem, lamgm, phigm, "U", 1, indii=indii, indjj=indjj
+        gds.ua,
+        lamem,
+        phiem,
+        lamgm,
+        phigm,
+        "U",
+        1,
+        indii=indii,
+        indjj=indjj,
+        radian=True,
     )
     uvge = interpolate_horizontal(
-        gds.ua, lamem, phiem, lamgm, phigm, "U", 2, indii=indii, indjj=indjj
+        gds.ua,
+        lamem,
+        phiem,
+        lamgm,
+        phigm,
+        "U",
+        2,
+        indii=indii,
+        indjj=indjj,
+        radian=True,
     )
     vge = interpolate_horizontal(
-        gds.va, lamem, phiem, lamgm, phigm, "V", 2, indii=indii, indjj=indjj
+        gds.va,
+        lamem,
+        phiem,
+        lamgm,
+        phigm,
+        "V",
+        2,
+        indii=indii,
+        indjj=indjj,
+        radian=True,
     )
     vuge = interpolate_horizontal(
-        gds.va, lamem, phiem, lamgm, phigm, "V", 1, indii=indii, indjj=indjj
+        gds.va,
+        lamem,
+        phiem,
+        lamgm,
+        phigm,
+        "V",
+        1,
+        indii=indii,
+        indjj=indjj,
+        radian=True,
     )
     fibge = interpolate_horizontal(
-        gds.orog, lamem, phiem, lamgm, phigm, "FIB", indii=indii, indjj=indjj
+        gds.orog,
+        lamem,
+        phiem,
+        lamgm,
+        phigm,
+        "FIB",
+        indii=indii,
+        indjj=indjj,
+        radian=True,
     )
     # return uge, vge
     # geopotential
@@ -225,7 +273,7 @@ def remap(gds, domain_info, vc, surflib):
     )  # .squeeze(drop=True)
 
     ficge = interpolate_horizontal(
-        ficgm, lamem, phiem, lamgm, phigm, "FIC", indii=indii, indjj=indjj
+        ficgm, lamem, phiem, lamgm, phigm, "FIC", indii=indii, indjj=indjj, radian=True
     )
 
     if "clw" in gds:
@@ -234,12 +282,28 @@ def remap(gds, domain_info, vc, surflib):
     else:
         arfgm = relative_humidity(gds.hus, gds.ta, gds.ps, gds.akgm, gds.bkgm)
     arfge = interpolate_horizontal(
-        arfgm, lamem, phiem, lamgm, phigm, "AREL HUM", indii=indii, indjj=indjj
+        arfgm,
+        lamem,
+        phiem,
+        lamgm,
+        phigm,
+        "AREL HUM",
+        indii=indii,
+        indjj=indjj,
+        radian=True,
     )
     # return arfge
     # wind vector rotation
     uge_rot, vge_rot = rotate_uv(
-        uge, vge, uvge, vuge, lamem, phiem, domain_info["pollon"], domain_info["pollat"]
+        uge,
+        vge,
+        uvge,
+        vuge,
+        lamem,
+        phiem,
+        domain_info["pollon"],
+        domain_info["pollat"],
+        radian=True,
     )
     # return uge_rot, vge_rot
     # first pressure correction
@@ -293,6 +357,9 @@ def remap(gds, domain_info, vc, surflib):
         # blagm=np.around(gds.sftlf),
         blagm=xr.where(gds.tos.isnull(), 1.0, 0.0),
         blaem=surflib.BLA.squeeze(drop=True),
+        indii=indii,
+        indjj=indjj,
+        radian=True,
     )
 
     # check if gcm contains seaice, else derive from sst
@@ -305,6 +372,9 @@ def remap(gds, domain_info, vc, surflib):
             phigm,
             blagm=np.around(gds.sftlf),
             blaem=surflib.BLA.squeeze(drop=True),
+            indii=indii,
+            indjj=indjj,
+            radian=True,
         )
     else:
         seaice = physics.seaice(tsw)
@@ -1068,15 +1138,39 @@ def add_surflib(ads, surflib):
     )
 
 
-def remap_sst(tos, lamem, phiem, lamgm, phigm, blagm, blaem):
+def remap_sst(
+    tos, lamem, phiem, lamgm, phigm, blagm, blaem, indii=None, indjj=None, radian=False
+):
     return interpolate_horizontal(
-        tos, lamem, phiem, lamgm, phigm, "TSW", blagm=blagm, blaem=blaem
+        tos,
+        lamem,
+        phiem,
+        lamgm,
+        phigm,
+        "TSW",
+        blagm=blagm,
+        blaem=blaem,
+        indii=indii,
+        indjj=indjj,
+        radian=radian,
     )
 
 
-def remap_seaice(sic, lamem, phiem, lamgm, phigm, blagm, blaem):
+def remap_seaice(
+    sic, lamem, phiem, lamgm, phigm, blagm, blaem, indii=None, indjj=None, radian=False
+):
     seaice = interpolate_horizontal(
-        sic, lamem, phiem, lamgm, phigm, "SEAICE", blagm=blagm, blaem=blaem
+        sic,
+        lamem,
+        phiem,
+        lamgm,
+        phigm,
+        "SEAICE",
+        blagm=blagm,
+        blaem=blaem,
+        indii=indii,
+        indjj=indjj,
+        radian=radian,
     )
     seaice = xr.where(seaice < 0.0, 0.0, seaice)
     return seaice
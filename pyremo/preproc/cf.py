@@ -376,11 +376,9 @@ def open_datasets(datasets, ref_ds=None, time_range=None):
         time_range = ref_ds.time
     dsets = []
     for var, f in datasets.items():
-        try:
-            da = open_mfdataset(f, chunks={"time": 1})[var]
+        da = open_mfdataset(f)[var]
+        if "time" in da.dims:
             da = da.sel(time=time_range)
-        except Exception:
-            da = open_mfdataset(f, chunks={})[var]
         if "vertical" in da.cf:
             da = check_lev(da)
         dsets.append(da)
@@ -4,6 +4,9 @@ This module wraps the pyintorg interfaces into xr.apply_ufunc.
 
 """
 
+import functools
+import glob
+import hashlib
 import warnings
 
 import cf_xarray as cfxr
@@ -19,6 +22,7 @@ except Exception:
         "could not find pyintorg, you need this for preprocessing. Please consider installing it from https://gitlab.dkrz.de/remo/pyintorg.git"
     )
 
+from ..core.utilities import bounds_and_midpoints
 from .constants import lev, lev_gm, lev_i
 
 
@@ -33,6 +37,68 @@ def pbl_index(akgm, bkgm):
     return intf.pbl_index(akgm, bkgm)
 
 
+def deg2rad(da):
+    """convert degree to radian as done by the fortran preprocessor"""
+    return da * 1.0 / 57.296
+
+
+def _loop_core_dims(func, input_core_dims, output_dtypes):
+    """Loop a pyintorg kernel over all non-core dimensions.
+
+    This works like ``xr.apply_ufunc(..., vectorize=True)``: array arguments
+    are broadcast once to the full loop shape and indexed for each call,
+    non-array arguments (e.g., the variable name) are passed through. Results
+    are written into preallocated output arrays of ``output_dtypes``, like the
+    ``otypes`` cast done by ``np.vectorize``.
+
+    """
+    core_ndims = [len(dims) for dims in input_core_dims]
+
+    def wrapper(*args):
+        args = [np.asarray(arg) if hasattr(arg, "shape") else arg for arg in args]
+        arrays = [i for i, arg in enumerate(args) if isinstance(arg, np.ndarray)]
+        loop_shape = np.broadcast(
+            *[
+                np.empty(args[i].shape[: args[i].ndim - core_ndims[i]], dtype=bool)
+                for i in arrays
+            ]
+        ).shape
+        for i in arrays:
+            core_shape = args[i].shape[args[i].ndim - core_ndims[i] :]
+            args[i] = np.broadcast_to(args[i], loop_shape + core_shape)
+
+        output = None
+        call_args = list(args)
+        for index in np.ndindex(loop_shape):
+            for i in arrays:
+                call_args[i] = args[i][index]
+            result = func(*call_args)
+            results = result if isinstance(result, tuple) else (result,)
+            if output is None:
+                output = tuple(
+                    np.empty(loop_shape + np.shape(res), dtype=dtype)
+                    for res, dtype in zip(results, output_dtypes)
+                )
+            for out, res in zip(output, results):
+                out[index] = res
+        return output if isinstance(result, tuple) else output[0]
+
+    return wrapper
+
+
+def _file_list(files):
+    """Expand ``files`` into a list of filenames like xarray.open_mfdataset."""
+    if isinstance(files, (list, tuple)):
+        paths = [str(f) for f in files]
+    elif any(c in str(files) for c in "*?["):
+        paths = sorted(glob.glob(str(files)))
+    else:
+        paths = [str(files)]
+    if not paths:
+        raise OSError("no files to open")
+    return paths
+
+
 def open_mfdataset(
     files,
     use_cftime=True,
@@ -48,44 +114,65 @@ def open_mfdataset(
 
     based on https://github.com/pydata/xarray/issues/1385#issuecomment-561920115
 
-    """
+    With ``chunks={}``, each variable uses its native on-disk chunks.
 
-    def drop_all_coords(ds):
-        # ds = ds.drop(drop)
-        return ds.reset_coords(drop=True)
-
-    ds = xr.open_mfdataset(
-        files,
-        parallel=parallel,
-        decode_times=False,
-        combine="by_coords",
-        preprocess=drop_all_coords,
-        decode_cf=False,
-        chunks=chunks,
-        data_vars=data_vars,
-        coords="minimal",
-        compat="override",
-        **kwargs,
-    )
-    return xr.decode_cf(ds, use_cftime=use_cftime)
+    Non-index coordinates are dropped once after combining the files.
+    Variables in ``drop`` are dropped by the backend using ``drop_variables``.
+
+    """
+    paths = _file_list(files)
+
+    drop_variables = []
+    for names in [kwargs.pop("drop_variables", None), drop]:
+        if names is not None:
+            drop_variables += [names] if isinstance(names, str) else list(names)
+
+    if len(paths) == 1:
+        # skip the combine machinery of open_mfdataset
+        for kwarg in ["concat_dim", "join", "combine_attrs", "attrs_file"]:
+            kwargs.pop(kwarg, None)
+        preprocess = kwargs.pop("preprocess", None)
+        ds = xr.open_dataset(
+            paths[0],
+            decode_times=False,
+            decode_cf=False,
+            chunks={} if chunks is None else chunks,
+            drop_variables=drop_variables or None,
+            **kwargs,
+        )
+        if preprocess is not None:
+            ds = preprocess(ds)
+    else:
+        ds = xr.open_mfdataset(
+            files,
+            parallel=parallel,
+            decode_times=False,
+            combine="by_coords",
+            decode_cf=False,
+            chunks=chunks,
+            data_vars=data_vars,
+            coords="minimal",
+            compat="override",
+            drop_variables=drop_variables or None,
+            **kwargs,
+        )
+    return xr.decode_cf(ds.reset_coords(drop=True), use_cftime=use_cftime)
 
 
 def get_akbkem(vc):
     """create vertical coordinate dataset"""
-    akbk = vc.to_xarray().drop("index")
     # bkem = pr.tables.vc.tables['vc_27lev']
-    akem = akbk.ak.swap_dims({"index": lev_i})
-    bkem = akbk.bk.swap_dims({"index": lev_i})
-    akhem = (0.5 * (akbk.ak[:-1] + akbk.ak[1:])).swap_dims({"index": lev})
-    bkhem = (0.5 * (akbk.bk[:-1] + akbk.bk[1:])).swap_dims({"index": lev})
-    akem[lev_i] = xr.DataArray(np.arange(1, akem.size + 1), dims=lev_i)
-    bkem[lev_i] = xr.DataArray(np.arange(1, bkem.size + 1), dims=lev_i)
-    akhem[lev] = xr.DataArray(np.arange(1, akhem.size + 1), dims=lev, name="akh")
-    bkhem[lev] = xr.DataArray(np.arange(1, bkhem.size + 1), dims=lev, name="bkh")
-    akhem.name = "akh"
-    bkhem.name = "bkh"
-    return xr.merge([akem, bkem, akhem, bkhem])
-    # return akem, bkem, akhem, bkhem
+    ak = vc["ak"].to_numpy()
+    bk = vc["bk"].to_numpy()
+    return xr.Dataset(
+        {
+            "ak": (lev_i, ak),
+            "bk": (lev_i, bk),
+            "akh": (lev, bounds_and_midpoints(ak)[1]),
+            "bkh": (lev, bounds_and_midpoints(bk)[1]),
+        },
+        coords={lev_i: np.arange(1, ak.size + 1), lev: np.arange(1, ak.size)},
+    )
 
 
 def horizontal_dims(da):
@@ -97,23 +184,26 @@ def horizontal_dims(da):
     return (lon_dim, lat_dim)
 
 
-def intersect(lamgm, phigm, lamem, phiem):
+def intersect(lamgm, phigm, lamem, phiem, radian=False):
+    if radian is False:
+        lamgm, phigm, lamem, phiem = map(deg2rad, (lamgm, phigm, lamem, phiem))
     gcm_dims = list(horizontal_dims(lamgm))
     rcm_dims = list(horizontal_dims(lamem))
     rcm_dims.append("pos")
     out_dims = rcm_dims
+    input_core_dims = [
+        gcm_dims,
+        gcm_dims,
+        rcm_dims,
+        rcm_dims,
+    ]
     result = xr.apply_ufunc(
         intf.intersection_points,  # first the function
-        lamgm * 1.0 / 57.296,  # now arguments in the order expected by 'druint'
-        phigm * 1.0 / 57.296,
-        lamem * 1.0 / 57.296,
-        phiem * 1.0 / 57.296,
-        input_core_dims=[
-            gcm_dims,
-            gcm_dims,
-            rcm_dims,
-            rcm_dims,
-        ],  # list with one entry per arg
+        lamgm,  # now arguments in the order expected by 'druint'
+        phigm,
+        lamem,
+        phiem,
+        input_core_dims=input_core_dims,  # list with one entry per arg
         # returned data has 3 dimensions
         output_core_dims=[out_dims, out_dims],
         dask="parallelized",
@@ -195,13 +285,22 @@ def interpolate_horizontal(
     blaem=None,
     indii=None,
     indjj=None,
+    radian=False,
 ):
+    """Interpolate horizontally from the global to the regional grid.
+
+    If ``radian=True``, the coordinates are expected in radian already, e.g.,
+    to avoid converting them for each field.
+
+    """
     if name is None:
         name = da.name
     if igr is None:
         igr = 0
+    if radian is False:
+        lamem, phiem, lamgm, phigm = map(deg2rad, (lamem, phiem, lamgm, phigm))
     if indii is None or indjj is None:
-        indii, indjj = intersect(lamgm, phigm, lamem, phiem)
+        indii, indjj = intersect(lamgm, phigm, lamem, phiem, radian=True)
     if blagm is None or blaem is None:
         return interp_horiz(
             da,
@@ -212,6 +311,7 @@ def interpolate_horizontal(
             indii.isel(pos=igr),
             indjj.isel(pos=igr),
             name,
+            radian=True,
         )
     else:
         return interp_horiz_cm(
@@ -225,6 +325,7 @@ def interpolate_horizontal(
             name,
             blagm,
             blaem,
+            radian=True,
         )
 
 
@@ -275,8 +376,12 @@ def interpolate_horizontal_remo(
 #     return intorg.hiobla(field, lamgm, phigm, lamem, phiem, indii, indjj, name)
 
 
-def interp_horiz(da, lamgm, phigm, lamem, phiem, indii, indjj, name, keep_attrs=False):
+def interp_horiz(
+    da, lamgm, phigm, lamem, phiem, indii, indjj, name, keep_attrs=False, radian=False
+):
     """main interface"""
+    if radian is False:
+        lamgm, phigm, lamem, phiem = map(deg2rad, (lamgm, phigm, lamem, phiem))
     gcm_dims = list(horizontal_dims(lamgm))
     rcm_dims = list(horizontal_dims(lamem))
     input_core_dims = [
@@ -290,18 +395,19 @@ def interp_horiz(da, lamgm, phigm, lamem, phiem, indii, indjj, name, keep_attrs=
         [],
     ]
     result = xr.apply_ufunc(
-        intf.interp_horiz_2d,  # first the function
+        _loop_core_dims(
+            intf.interp_horiz_2d, input_core_dims, [da.dtype]
+        ),  # first the function
         da,  # now arguments in the order expected
-        lamgm * 1.0 / 57.296,
-        phigm * 1.0 / 57.296,
-        lamem * 1.0 / 57.296,
-        phiem * 1.0 / 57.296,
+        lamgm,
+        phigm,
+        lamem,
+        phiem,
         indii,
         indjj,
         name,
         input_core_dims=input_core_dims,  # list with one entry per arg
         output_core_dims=[rcm_dims],  # returned data has 3 dimensions
-        vectorize=True,  # loop over non-core dims, in this case: time
         #  exclude_dims=set(("lev",)),  # dimensions allowed to change size. Must be a set!
         dask="parallelized",
         dask_gufunc_kwargs={"allow_rechunk": True},
@@ -323,7 +429,9 @@ def interp_horiz_remo(da, indemi, indemj, dxemhm, dyemhm, name, keep_attrs=False
     input_core_dims = [em_dims] + 4 * [hm_dims] + [[]]
     # return
     result = xr.apply_ufunc(
-        intf.interp_horiz_remo_2d,  # first the function
+        _loop_core_dims(
+            intf.interp_horiz_remo_2d, input_core_dims, [da.dtype]
+        ),  # first the function
         da,  # now arguments in the order expected
         indemi,
         indemj,
@@ -332,7 +440,6 @@ def interp_horiz_remo(da, indemi, indemj, dxemhm, dyemhm, name, keep_attrs=False
         name,
         input_core_dims=input_core_dims,  # list with one entry per arg
         output_core_dims=[hm_dims],  # returned data has 3 dimensions
-        vectorize=True,  # loop over non-core dims, in this case: time, lev
         #  exclude_dims=set(("lev",)),  # dimensions allowed to change size. Must be a set!
         dask="parallelized",
         dask_gufunc_kwargs={"allow_rechunk": True},
@@ -348,9 +455,22 @@ def interp_horiz_remo(da, indemi, indemj, dxemhm, dyemhm, name, keep_attrs=False
 
 
 def interp_horiz_cm(
-    da, lamgm, phigm, lamem, phiem, indii, indjj, name, blagm, blaem, keep_attrs=False
+    da,
+    lamgm,
+    phigm,
+    lamem,
+    phiem,
+    indii,
+    indjj,
+    name,
+    blagm,
+    blaem,
+    keep_attrs=False,
+    radian=False,
 ):
     """main interface"""
+    if radian is False:
+        lamgm, phigm, lamem, phiem = map(deg2rad, (lamgm, phigm, lamem, phiem))
     gcm_dims = list(horizontal_dims(lamgm))
     rcm_dims = list(horizontal_dims(lamem))
     input_core_dims = [
@@ -366,21 +486,22 @@ def interp_horiz_cm(
         [],
     ]
     result = xr.apply_ufunc(
-        intf.interp_horiz_2d_cm,  # first the function
+        _loop_core_dims(
+            intf.interp_horiz_2d_cm, input_core_dims, [da.dtype]
+        ),  # first the function
         da,  # now arguments in the order expected
         blagm,
         blaem,
-        lamgm * 1.0 / 57.296,
-        phigm * 1.0 / 57.296,
-        lamem * 1.0 / 57.296,
-        phiem * 1.0 / 57.296,
+        lamgm,
+        phigm,
+        lamem,
+        phiem,
         indii,
         indjj,
         name,
         # dataset_fill_value=1.e20,
         input_core_dims=input_core_dims,  # list with one entry per arg
         output_core_dims=[rcm_dims],  # returned data has 3 dimensions
-        vectorize=True,  # loop over non-core dims, in this case: time
         #  exclude_dims=set(("lev",)),  # dimensions allowed to change size. Must be a set!
         dask="parallelized",
         dask_gufunc_kwargs={"allow_rechunk": True},
@@ -431,7 +552,9 @@ def interp_horiz_remo_cm(
         ice_args = (lice, siceem, sicehm)
     # return
     result = xr.apply_ufunc(
-        intf.interp_horiz_remo_2d_cm,  # first the function
+        _loop_core_dims(
+            intf.interp_horiz_remo_2d_cm, input_core_dims, [da.dtype]
+        ),  # first the function
         da,  # now arguments in the order expected
         indemi.isel(pos=0),
         indemj.isel(pos=0),
@@ -447,7 +570,6 @@ def interp_horiz_remo_cm(
         *ice_args,
         input_core_dims=input_core_dims,  # list with one entry per arg
         output_core_dims=[hm_dims],  # returned data has 3 dimensions
-        vectorize=True,  # loop over non-core dims, in this case: time, lev
         #  exclude_dims=set(("lev",)),  # dimensions allowed to change size. Must be a set!
         dask="parallelized",
         dask_gufunc_kwargs={"allow_rechunk": True},
@@ -484,7 +606,9 @@ def geopotential(fibgm, tgm, qdgm, psgm, akgm, bkgm):
     ]
     # print(input_core_dims)
     result = xr.apply_ufunc(
-        intf.geopotential,  # first the function
+        _loop_core_dims(
+            intf.geopotential, input_core_dims, [fibgm.dtype]
+        ),  # first the function
         fibgm,  # now arguments in the order expected
         tgm,
         qdgm,
@@ -494,7 +618,6 @@ def geopotential(fibgm, tgm, qdgm, psgm, akgm, bkgm):
         input_core_dims=input_core_dims,  # list with one entry per arg
         #  output_core_dims=[threeD_dims],  # returned data has 3 dimensions
         output_core_dims=[twoD_dims],  # returned data has 3 dimensions
-        vectorize=True,  # loop over non-core dims, in this case: time
         # exclude_dims=set(("lev",)),  # dimensions allowed to change size. Must be a set!
         dask="parallelized",
         dask_gufunc_kwargs={"allow_rechunk": True},
@@ -520,7 +643,9 @@ def relative_humidity(qdgm, tgm, psgm, akgm, bkgm, qwgm=None):
         threeD_dims,
     ]
     result = xr.apply_ufunc(
-        intf.relative_humidity,  # first the function
+        _loop_core_dims(
+            intf.relative_humidity, input_core_dims, [qdgm.dtype]
+        ),  # first the function
         qdgm,  # now arguments in the order expected
         tgm,
         psgm,
@@ -530,7 +655,6 @@ def relative_humidity(qdgm, tgm, psgm, akgm, bkgm, qwgm=None):
         input_core_dims=input_core_dims,  # list with one entry per arg
         #  output_core_dims=[threeD_dims],  # returned data has 3 dimensions
         output_core_dims=[threeD_dims],  # returned data has 3 dimensions
-        vectorize=True,  # loop over non-core dims, in this case: time
         # exclude_dims=set(("lev",)),  # dimensions allowed to change size. Must be a set!
         dask="parallelized",
         dask_gufunc_kwargs={"allow_rechunk": True},
@@ -615,15 +739,17 @@ def get_vc(ds):
     #        print('could not identify vertical coordinate, tried: {}, {}'.format(ak_valid, bk_valid))
     #        raise Exception('incomplete input dataset')
     #        ak_bnds, bk_bnds  = (ak_bnds[:1], bk_bnds[:,1])
-    nlev = ak_bnds.shape[0]
-    ak = np.zeros([nlev + 1], dtype=np.float64)
-    bk = np.ones([nlev + 1], dtype=np.float64)
+    a = np.flip(np.asarray(ak_bnds[:, 1], dtype=np.float64))
+    b = np.flip(np.asarray(bk_bnds[:, 1], dtype=np.float64))
+    # surface value of the hybrid coordinate: ak=0, bk=1
+    pad_a = np.zeros(1, dtype=a.dtype)
+    pad_b = np.ones(1, dtype=b.dtype)
     if ds.lev.positive == "down":
-        ak[:-1] = np.flip(ak_bnds[:, 1])
-        bk[:-1] = np.flip(bk_bnds[:, 1])
+        ak = np.concatenate([a, pad_a])
+        bk = np.concatenate([b, pad_b])
     else:
-        ak[1:] = np.flip(ak_bnds[:, 1])
-        bk[1:] = np.flip(bk_bnds[:, 1])
+        ak = np.concatenate([pad_a, a])
+        bk = np.concatenate([pad_b, b])
 
     return xr.DataArray(ak, dims="lev_2"), xr.DataArray(bk, dims="lev_2")
 
@@ -668,11 +794,98 @@ def get_vc2(ds):
     return ak, bk
 
 
-def map_sst(tos, ref_ds, resample="6H", regrid=True):
-    from datetime import timedelta as td
+def _lon_lat(ds):
+    """Get longitude and latitude the same way as xesmf does."""
+    if "lon" in ds.variables and "lat" in ds.variables:
+        return ds["lon"], ds["lat"]
+    return ds.cf["longitude"], ds.cf["latitude"]
+
+
+class _Grid:
+    """Horizontal grid (and mask) of a dataset, hashable by its values."""
+
+    def __init__(self, ds):
+        lon, lat = _lon_lat(ds)
+        grid = xr.Dataset(coords={lon.name: lon, lat.name: lat})
+        if "mask" in ds:
+            grid["mask"] = ds.mask
+        self.ds = grid.reset_coords(drop=False)
+        h = hashlib.sha1()
+        for name, var in self.ds.variables.items():
+            h.update(repr((name, var.dims, var.shape, var.dtype.str)).encode())
+            h.update(np.ascontiguousarray(var.values).tobytes())
+        self.key = h.hexdigest()
 
+    def __hash__(self):
+        return hash(self.key)
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_regridder(grid_in, grid_out, method):
     import xesmf as xe
 
+    return xe.Regridder(grid_in.ds, grid_out.ds, method)
+
+
+def _get_regridder(ds_in, ds_out, method):
+    """Create a regridder or reuse one with the same grids and method.
+
+    Computing the weights is the most expensive part of the regridding,
+    so regridders are cached by their grids and method.
+
+    """
+    return _cached_regridder(_Grid(ds_in), _Grid(ds_out), method)
+
+
+def _interp_time(ds, time):
+    """Linear interpolation along time to the timesteps in ``time``.
+
+    The interpolation indices and weights are computed once from the time axes
+    and then applied to the whole dataset, so this works lazily on dask arrays.
+    Raises a ``ValueError`` if ``time`` is not covered by the time axis of ``ds``.
+
+    """
+    src = ds.indexes["time"]
+    t0 = src[0]
+    t_src = np.asarray((src - t0).total_seconds())
+    t_tgt = np.asarray((time.to_index() - t0).total_seconds())
+    if t_src.size < 2 or t_tgt.min() < t_src[0] or t_tgt.max() > t_src[-1]:
+        raise ValueError(
+            "time range {} to {} is not covered by the input time range {} to {}".format(
+                time.values[0], time.values[-1], src[0], src[-1]
+            )
+        )
+    i1 = np.clip(np.searchsorted(t_src, t_tgt, side="right"), 1, t_src.size - 1)
+    i0 = i1 - 1
+    weight = xr.DataArray(
+        (t_tgt - t_src[i0]) / (t_src[i1] - t_src[i0]),
+        dims="time",
+        coords={"time": time.values},
+    )
+    lower = ds.isel(time=i0).assign_coords(time=time.values)
+    upper = ds.isel(time=i1).assign_coords(time=time.values)
+    return lower * (1.0 - weight) + upper * weight
+
+
+def map_sst(tos, ref_ds, resample=None, regrid=True):
+    """Map sea surface temperature to the timesteps and grid of ``ref_ds``.
+
+    The sst is interpolated linearly to the timesteps of ``ref_ds``. The
+    ``resample`` argument is deprecated and ignored.
+
+    """
+    from datetime import timedelta as td
+
+    if resample is not None:
+        warnings.warn(
+            "the resample argument of map_sst is deprecated and ignored, "
+            "sst is interpolated to the timesteps of ref_ds directly.",
+            DeprecationWarning,
+        )
+
     try:
         tos = tos.to_dataset()
     except Exception:
@@ -683,48 +896,64 @@ def map_sst(tos, ref_ds, resample="6H", regrid=True):
     tos = tos.sel(time=slice(tos_times[0], tos_times[1]))
     # return tos_res
     # tos = tos.resample(time=resample).interpolate("linear").chunk({"time": 1})
-    tos = tos.resample(time=resample).interpolate("linear")
-    tos = tos.sel(time=ref_ds.time)
+    # interpolate directly to the target times instead of resampling first,
+    # non-numeric variables, e.g., time bounds, are dropped.
+    time_vars = [
+        var
+        for var in tos.data_vars
+        if "time" in tos[var].dims and np.issubdtype(tos[var].dtype, np.number)
+    ]
+    tos = xr.merge([_interp_time(tos[time_vars], ref_ds.time), tos.drop_dims("time")])
 
     if regrid:
         ref_ds["mask"] = ~(ref_ds.sftlf > 0)
         tos["mask"] = ~tos.tos.isel(time=0).isnull().squeeze(drop=True)
-        regridder = xe.Regridder(tos, ref_ds, "nearest_s2d")
+        regridder = _get_regridder(tos, ref_ds, "nearest_s2d")
         tos = regridder(tos.tos)
     tos.attrs.update(attrs)
 
     return tos
 
 
+# unit conversion rules for the preprocessor:
+# variable: (input units, conversion, output units, message, warning)
+units_convert_rules = {
+    "sftlf": (
+        "%",
+        lambda x: x * 0.01,
+        1,
+        "converting sftlf units to fractional",
+        "sftlf has no units attribute, must be fractional.",
+    ),
+    "tos": (
+        "degC",
+        lambda x: x + const.absolute_zero,
+        "K",
+        "converting tos units to K",
+        "tos has no units attribute, must be Kelvin!",
+    ),
+    "orog": (
+        "m",
+        lambda x: x * const.grav_const,
+        "m2 s-2",
+        "converting orography to geopotential",
+        "orog has no units attribute, must be m2 s-2",
+    ),
+}
+
+
 def convert_units(ds):
     """convert units for use in the preprocessor"""
-    try:
-        if ds.sftlf.units == "%":
-            print("converting sftlf units to fractional")
-            attrs = ds.sftlf.attrs
-            ds["sftlf"] = ds.sftlf * 0.01
-            attrs["units"] = 1
-            ds.sftlf.attrs = attrs
-    except Exception:
-        warnings.warn("sftlf has no units attribute, must be fractional.")
-    try:
-        if ds.tos.units == "degC":
-            print("converting tos units to K")
-            attrs = ds.tos.attrs
-            ds["tos"] = ds.tos + const.absolute_zero
-            attrs["units"] = "K"
-            ds.tos.attrs = attrs
-    except Exception:
-        warnings.warn("tos has no units attribute, must be Kelvin!")
-    try:
-        if ds.orog.units == "m":
-            print("converting orography to geopotential")
-            attrs = ds.orog.attrs
-            ds["orog"] = ds.orog * const.grav_const
-            attrs["units"] = "m2 s-2"
-            ds.orog.attrs = attrs
-    except Exception:
-        warnings.warn("orog has no units attribute, must be m2 s-2")
+    for name, (units, convert, cf_units, msg, warning) in units_convert_rules.items():
+        if name not in ds:
+            continue
+        if "units" not in ds[name].attrs:
+            warnings.warn(warning)
+        elif ds[name].units == units:
+            print(msg)
+            attrs = dict(ds[name].attrs, units=cf_units)
+            ds[name] = convert(ds[name])
+            ds[name].attrs = attrs
     return ds
 
 
@@ -755,11 +984,9 @@ def open_datasets(datasets, ref_ds=None, time_range=None):
         time_range = ref_ds.time
     dsets = []
     for var, f in datasets.items():
-        try:
-            da = open_mfdataset(f, chunks={"time": 1})[var]
+        da = open_mfdataset(f)[var]
+        if "time" in da.dims:
             da = da.sel(time=time_range)
-        except Exception:
-            da = open_mfdataset(f, chunks={})[var]
         if "vertical" in da.cf:
             da = check_lev(da)
         dsets.append(da)
@@ -824,29 +1051,32 @@ def gfile(ds, ref_ds=None, tos=None, time_range=None, attrs=None):
     return ds
 
 
-def rotate_uv(uge, vge, uvge, vuge, lamem, phiem, pollam, polphi):
+def rotate_uv(uge, vge, uvge, vuge, lamem, phiem, pollam, polphi, radian=False):
+    if radian is False:
+        lamem, phiem = deg2rad(lamem), deg2rad(phiem)
     ulamem, uphiem = lamem.isel(pos=1), phiem.isel(pos=1)
     vlamem, vphiem = lamem.isel(pos=2), phiem.isel(pos=2)
     twoD_dims = list(horizontal_dims(uge))
     input_core_dims = 4 * [twoD_dims + [lev_gm]] + 4 * [twoD_dims] + 2 * [[]]
 
     uge_rot, vge_rot = xr.apply_ufunc(
-        intf.rotate_uv,  # first the function
+        _loop_core_dims(
+            intf.rotate_uv, input_core_dims, (uge.dtype, vge.dtype)
+        ),  # first the function
         uge,  # now arguments in the order expected
         vge,
         uvge,
         vuge,
-        ulamem * 1.0 / 57.296,  # pi/180 (deg2rad)
-        uphiem * 1.0 / 57.296,
-        vlamem * 1.0 / 57.296,
-        vphiem * 1.0 / 57.296,
+        ulamem,
+        uphiem,
+        vlamem,
+        vphiem,
         pollam,
         polphi,
         input_core_dims=input_core_dims,  # list with one entry per arg
         #  output_core_dims=[threeD_dims],  # returned data has 3 dimensions
         # returned data has 3 dimensions
         output_core_dims=2 * [twoD_dims + [lev_gm]],
-        vectorize=True,  # loop over non-core dims, in this case: time
         # exclude_dims=set(("lev",)),  # dimensions allowed to change size. Must be a set!
         dask="parallelized",
         dask_gufunc_kwargs={"allow_rechunk": True},
@@ -866,7 +1096,9 @@ def pressure_correction_em(psge, tge, arfge, fibge, fibem, akgm, bkgm, kpbl):
     )
     # print(input_core_dims)
     result = xr.apply_ufunc(
-        intf.pressure_correction_em,  # first the function
+        _loop_core_dims(
+            intf.pressure_correction_em, input_core_dims, [psge.dtype]
+        ),  # first the function
         psge,  # now arguments in the order expected
         tge,
         arfge,
@@ -877,7 +1109,6 @@ def pressure_correction_em(psge, tge, arfge, fibge, fibem, akgm, bkgm, kpbl):
         kpbl,
         input_core_dims=input_core_dims,  # list with one entry per arg
         output_core_dims=[twoD_dims],  # returned data has 3 dimensions
-        vectorize=True,  # loop over non-core dims, in this case: time
         dask="parallelized",
         dask_gufunc_kwargs={"allow_rechunk": True},
         output_dtypes=[psge.dtype],
@@ -906,7 +1137,9 @@ def interpolate_vertical(
     output_core_dims = [twoD_dims + [akhem.dims[0]]]
     # print(output_core_dims)
     result = xr.apply_ufunc(
-        intf.interp_vert,  # first the function
+        _loop_core_dims(
+            intf.interp_vert, input_core_dims, [xge.dtype]
+        ),  # first the function
         xge,  # now arguments in the order expected
         psge,
         ps1em,
@@ -920,7 +1153,6 @@ def interpolate_vertical(
         input_core_dims=input_core_dims,  # list with one entry per arg
         output_core_dims=output_core_dims,  # returned data has 3 dimensions
         # exclude_dims=set(("index",)),
-        vectorize=True,  # loop over non-core dims, in this case: time
         dask="parallelized",
         dask_gufunc_kwargs={"allow_rechunk": True},
         output_dtypes=[xge.dtype],
@@ -942,7 +1174,9 @@ def interpolate_vertical_remo(
     output_core_dims = [twoD_dims + [akhem.dims[0]]]
     # print(output_core_dims)
     result = xr.apply_ufunc(
-        intf.interp_vert2,  # first the function
+        _loop_core_dims(
+            intf.interp_vert2, input_core_dims, [xge.dtype]
+        ),  # first the function
         xge,  # now arguments in the order expected
         psge,
         ps1em,
@@ -955,7 +1189,6 @@ def interpolate_vertical_remo(
         input_core_dims=input_core_dims,  # list with one entry per arg
         output_core_dims=output_core_dims,  # returned data has 3 dimensions
         # exclude_dims=set(("index",)),
-        vectorize=True,  # loop over non-core dims, in this case: time
         dask="parallelized",
         dask_gufunc_kwargs={"allow_rechunk": True},
         output_dtypes=[xge.dtype],
@@ -975,7 +1208,9 @@ def pressure_correction_ge(ps1em, tem, arfem, ficge, fibem, akem, bkem):
     )
     # print(input_core_dims)
     result = xr.apply_ufunc(
-        intf.pressure_correction_ge,  # first the function
+        _loop_core_dims(
+            intf.pressure_correction_ge, input_core_dims, [ps1em.dtype]
+        ),  # first the function
         ps1em,  # now arguments in the order expected
         tem,
         arfem,
@@ -985,7 +1220,6 @@ def pressure_correction_ge(ps1em, tem, arfem, ficge, fibem, akem, bkem):
         bkem,
         input_core_dims=input_core_dims,  # list with one entry per arg
         output_core_dims=[twoD_dims],  # returned data has 3 dimensions
-        vectorize=True,  # loop over non-core dims, in this case: time
         dask="parallelized",
         output_dtypes=[ps1em.dtype],
     )
@@ -1002,7 +1236,9 @@ def correct_uv(uem, vem, psem, akem, bkem, lamem, phiem, ll_lam, dlam, dphi):
     )
     # print(input_core_dims)
     uge_corr, vge_corr = xr.apply_ufunc(
-        intf.correct_uv,  # first the function
+        _loop_core_dims(
+            intf.correct_uv, input_core_dims, (uem.dtype, vem.dtype)
+        ),  # first the function
         uem,  # now arguments in the order expected
         vem,
         psem,
@@ -1015,7 +1251,6 @@ def correct_uv(uem, vem, psem, akem, bkem, lamem, phiem, ll_lam, dlam, dphi):
         #  output_core_dims=[threeD_dims],  # returned data has 3 dimensions
         # returned data has 3 dimensions
         output_core_dims=2 * [twoD_dims + [lev]],
-        vectorize=True,  # loop over non-core dims, in this case: time
         # exclude_dims=set(("lev",)),  # dimensions allowed to change size. Must be a set!
         dask="parallelized",
         #  dask_gufunc_kwargs = {'allow_rechunk':True},
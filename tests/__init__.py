@@ -17,3 +17,4 @@ def _importorskip(modname):
 
 has_pydruint, requires_pydruint = _importorskip("pydruint")
 has_pyintorg, requires_pyintorg = _importorskip("pyintorg")
+has_xesmf, requires_xesmf = _importorskip("xesmf")
@@ -1,7 +1,10 @@
 import datetime as dt
+import os
 
 import cftime as cfdt
 import cordex as cx
+import numpy as np
+import pandas as pd
 import pytest
 import xarray as xr
 from cordex.tables import cordex_cmor_table
@@ -51,6 +54,26 @@ def test_cmorizer_mon():
     assert "tas" in output
 
 
+def test_cmorizer_mon_chunked():
+    # irregular time chunks are written block by block
+    ds = pr.tutorial.open_dataset("remo_EUR-11_TEMP2_mon").chunk({"time": (5, 3, 4)})
+    eur11 = cx.cordex_domain("EUR-11")
+    ds = ds.assign_coords({"lon": eur11.lon, "lat": eur11.lat})
+    filename = prcmor.cmorize_variable(
+        ds,
+        "tas",
+        cmor_table=cordex_cmor_table("CORDEX_mon"),
+        dataset_table=cordex_cmor_table("CORDEX_remo_example"),
+        grids_table=cordex_cmor_table("CORDEX_grids"),
+        CORDEX_domain="EUR-11",
+        time_units=None,
+        allow_units_convert=True,
+    )
+    output = xr.open_dataset(filename)
+    assert output.dims["time"] == 12
+    assert "tas" in output
+
+
 @pytest.mark.parametrize("table, tdim", [("CORDEX_day", 3)])
 def test_cmorizer_subdaily(table, tdim):
     ds = pr.tutorial.open_dataset("remo_EUR-11_TEMP2_1hr")
@@ -70,3 +93,94 @@ def test_cmorizer_subdaily(table, tdim):
     output = xr.open_dataset(filename)
     assert "tas" in output
     assert output.dims["time"] == tdim
+
+
+def test_get_bnds():
+    from pyremo.cmor.remo_cmor import _get_bnds
+
+    bnds = _get_bnds([0.0, 1.0, 2.0, 4.0])
+    assert list(bnds) == [-0.5, 0.5, 1.5, 3.0, 5.0]
+
+
+@pytest.mark.parametrize("use_cftime", [False, True])
+@pytest.mark.parametrize("start", ["2000-01-01 00:00", "2000-01-01 00:30"])
+@pytest.mark.parametrize("freq", ["3H", "6H", "D"])
+def test_resample_point(freq, start, use_cftime):
+    from pyremo.cmor.remo_cmor import _resample
+
+    if use_cftime:
+        time = xr.cftime_range(start, periods=100, freq="H")
+    else:
+        time = pd.date_range(start, periods=100, freq="H")
+    ds = xr.Dataset(
+        {"tas": (("time", "x"), np.random.rand(100, 2))}, coords={"time": time}
+    )
+    expected = ds.resample(time=freq, label="left").nearest()
+    xr.testing.assert_equal(_resample(ds, freq), expected)
+
+
+def test_cftime_date():
+    assert prcmor.to_cftime(dt.date(2000, 1, 1)) == cfdt.datetime(2000, 1, 1)
+
+
+def test_cmorize_dataset_fx(monkeypatch):
+    from pyremo.cmor import remo_cmor
+
+    grids = []
+    define_axes = remo_cmor._define_axes
+
+    def _define_axes(*args, **kwargs):
+        grids.append(define_axes(*args, **kwargs))
+        return grids[-1]
+
+    monkeypatch.setattr(remo_cmor, "_define_axes", _define_axes)
+
+    ds = pr.data.surflib("EUR-11")
+    eur11 = cx.cordex_domain("EUR-11")
+    ds = ds.assign_coords({"lon": eur11.lon, "lat": eur11.lat})
+    varnames = ["orog", "sftlf"]
+    filenames = prcmor.cmorize_dataset(
+        ds,
+        varnames,
+        cmor_table=cordex_cmor_table("CORDEX_fx"),
+        dataset_table=cordex_cmor_table("CORDEX_remo_example"),
+        grids_table=cordex_cmor_table("CORDEX_grids"),
+        CORDEX_domain="EUR-11",
+        allow_units_convert=True,
+    )
+    # both variables share the same grid
+    assert len(grids) == 1
+    assert len(filenames) == len(varnames)
+    for varname, filename in zip(varnames, filenames):
+        assert os.path.isfile(filename)
+        output = xr.open_dataset(filename)
+        assert varname in output
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+def test_crop_to_cordex_domain(dtype):
+    from pyremo.cmor.remo_cmor import _crop_to_cordex_domain
+
+    eur11 = cx.cordex_domain("EUR-11")
+
+    def pad(x, n=3, dx=0.11):
+        # pad the domain by a few grid boxes on each side
+        x = x.values
+        return np.concatenate(
+            [x[0] - dx * np.arange(n, 0, -1), x, x[-1] + dx * np.arange(1, n + 1)]
+        ).astype(dtype)
+
+    rlon = pad(eur11.rlon)
+    rlat = pad(eur11.rlat)
+    ds = xr.Dataset(
+        {"tas": (("rlat", "rlon"), np.zeros((rlat.size, rlon.size)))},
+        coords={"rlon": rlon, "rlat": rlat},
+    )
+    cropped = _crop_to_cordex_domain(ds, "EUR-11")
+    expected = ds.sel(
+        rlon=slice(float(eur11.rlon.min()), float(eur11.rlon.max())),
+        rlat=slice(float(eur11.rlat.min()), float(eur11.rlat.max())),
+    )
+    xr.testing.assert_identical(cropped, expected)
+    assert cropped.rlon.size == eur11.rlon.size
+    assert cropped.rlat.size == eur11.rlat.size
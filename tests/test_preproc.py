@@ -1,10 +1,12 @@
+import numpy as np
 import pytest
+import xarray as xr
 
 import pyremo as pr
 from pyremo.preproc import gfile, remap
 from pyremo.tutorial import load_dataset, mpi_esm, mpi_esm_tos
 
-from . import requires_pyintorg
+from . import requires_pyintorg, requires_xesmf
 
 
 @pytest.fixture
@@ -52,3 +54,156 @@ def test_cf_preproc(gcm_ds):
     vc = pr.vc.tables["vc_27lev"]
     ads = remap(gcm_ds, domain_info, vc, surflib)
     assert "T" in ads
+
+
+def test_interp_time():
+    from pyremo.preproc.core import _interp_time
+
+    time = xr.cftime_range("2000-01-01", periods=5, freq="D")
+    ds = xr.Dataset(
+        {"tos": (("time", "lat"), np.random.rand(5, 3))}, coords={"time": time}
+    )
+    target = xr.cftime_range("2000-01-01", "2000-01-05", freq="6H")
+    expected = ds.resample(time="6H").interpolate("linear").sel(time=target)
+    result = _interp_time(ds, xr.DataArray(target, dims="time", name="time"))
+    xr.testing.assert_allclose(result, expected)
+    # no extrapolation before the first input timestep
+    early = xr.cftime_range("1999-12-31", periods=2, freq="D")
+    with pytest.raises(ValueError):
+        _interp_time(ds, xr.DataArray(early, dims="time", name="time"))
+
+
+def test_open_mfdataset_drop_variables(tmp_path):
+    from pyremo.preproc.core import open_mfdataset
+
+    ds = xr.Dataset(
+        {
+            "tas": ("time", np.zeros(2)),
+            "time_bnds": (("time", "bnds"), np.zeros((2, 2))),
+            "orog": ("x", np.zeros(3)),
+        },
+        coords={"time": [0, 1]},
+    )
+    filename = tmp_path / "f0.nc"
+    ds.to_netcdf(filename)
+    result = open_mfdataset(filename, drop_variables="time_bnds", drop="orog")
+    assert list(result.data_vars) == ["tas"]
+
+
+def test_loop_core_dims_output_dtypes():
+    from pyremo.preproc.core import _loop_core_dims
+
+    def kernel(a, b):
+        return a.astype("float64") + b
+
+    func = _loop_core_dims(kernel, [["x"], []], [np.float32])
+    a = np.ones((2, 3, 4), dtype="float32")
+    result = func(a, 1.0)
+    assert result.dtype == np.float32
+    np.testing.assert_array_equal(result, a + 1.0)
+
+
+@pytest.mark.parametrize("dask", [False, True])
+def test_loop_core_dims_vectorize(dask):
+    from pyremo.preproc.core import _loop_core_dims
+
+    def kernel(a, b, c, factor, name):
+        assert name == "T"
+        return (a + b * factor).astype("float64"), a[:2] - c.sum()
+
+    # b is missing the leading time dim, c gets an inserted size-1 lev dim
+    a = xr.DataArray(
+        np.random.rand(2, 3, 4).astype("float32"), dims=("time", "lev", "x")
+    )
+    b = xr.DataArray(np.random.rand(3, 4).astype("float32"), dims=("lev", "x"))
+    c = xr.DataArray(np.random.rand(2, 4).astype("float32"), dims=("time", "x"))
+    if dask:
+        a, b, c = a.chunk(time=1), b.chunk(), c.chunk(time=1)
+    input_core_dims = [["x"], ["x"], ["x"], [], []]
+    kwargs = dict(
+        input_core_dims=input_core_dims,
+        output_core_dims=[["x"], ["y"]],
+        dask="parallelized",
+        dask_gufunc_kwargs={"output_sizes": {"y": 2}},
+        output_dtypes=[a.dtype, a.dtype],
+    )
+    expected = xr.apply_ufunc(kernel, a, b, c, 2.0, "T", vectorize=True, **kwargs)
+    result = xr.apply_ufunc(
+        _loop_core_dims(kernel, input_core_dims, [a.dtype, a.dtype]),
+        a,
+        b,
+        c,
+        2.0,
+        "T",
+        **kwargs,
+    )
+    for res, exp in zip(result, expected):
+        assert res.dtype == exp.dtype == np.float32
+        xr.testing.assert_identical(res.compute(), exp.compute())
+
+
+def test_open_mfdataset_single_file_lazy(tmp_path):
+    from pyremo.preproc.core import open_mfdataset
+
+    ds = xr.Dataset({"tas": ("time", np.zeros(2))}, coords={"time": [0, 1]})
+    filename = tmp_path / "f0.nc"
+    ds.to_netcdf(filename)
+    result = open_mfdataset(filename, chunks=None)
+    assert result.tas.chunks is not None
+
+
+def test_grid_key():
+    from pyremo.preproc.core import _Grid
+
+    def grid(shape, dims=("y", "x")):
+        values = np.arange(6.0).reshape(shape)
+        return xr.Dataset(coords={"lon": (dims, values), "lat": (dims, values)})
+
+    assert _Grid(grid((2, 3))) == _Grid(grid((2, 3)))
+    # same bytes, but different shape, dims or variables
+    assert _Grid(grid((3, 2))) != _Grid(grid((2, 3)))
+    assert _Grid(grid((2, 3), dims=("j", "i"))) != _Grid(grid((2, 3)))
+    masked = grid((2, 3))
+    masked["mask"] = masked.lon > 2
+    assert _Grid(masked) != _Grid(grid((2, 3)))
+
+
+@requires_xesmf
+def test_map_sst_regridder_cache():
+    import xesmf as xe
+
+    from pyremo.preproc.core import _cached_regridder, map_sst
+
+    values = np.random.rand(10, 10)
+    values[:3, :3] = np.nan
+    time = xr.cftime_range("2000-01-01", periods=3, freq="D")
+    tos = xr.Dataset(
+        {"tos": (("time", "lat", "lon"), np.stack(3 * [values]))},
+        coords={
+            "time": time,
+            "lon": np.arange(0.0, 20.0, 2.0),
+            "lat": np.arange(40.0, 60.0, 2.0),
+        },
+    )
+    ref_ds = xr.Dataset(
+        {"sftlf": (("lat", "lon"), (np.random.rand(8, 12) > 0.7).astype(float))},
+        coords={
+            "time": xr.cftime_range("2000-01-01 12:00", periods=2, freq="D"),
+            "lon": np.linspace(1.0, 17.0, 12),
+            "lat": np.linspace(41.0, 57.0, 8),
+        },
+    )
+    _cached_regridder.cache_clear()
+    result = map_sst(tos, ref_ds.copy())
+    map_sst(tos, ref_ds.copy())
+    info = _cached_regridder.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+    src = tos.isel(time=0, drop=True)
+    src["mask"] = ~src.tos.isnull()
+    dst = ref_ds.copy()
+    dst["mask"] = ~(dst.sftlf > 0)
+    expected = xe.Regridder(src, dst, "nearest_s2d")(src.tos)
+    for i in range(result.sizes["time"]):
+        np.testing.assert_allclose(result.isel(time=i).values, expected.values)
@@ -16,3 +16,11 @@ def test_absolute_calendar():
         dt.datetime(1979, 1, 1, 0, 0),
         dt.datetime(1979, 1, 1, 12, 0),
     ] == pr.parse_absolute_time([19790101, 19790101.5])
+
+
+def test_bounds_and_midpoints():
+    from pyremo.core.utilities import bounds_and_midpoints
+
+    bnds, mids = bounds_and_midpoints([0, 1, 2, 4])
+    assert list(bnds) == [-0.5, 0.5, 1.5, 3.0, 5.0]
+    assert list(mids) == [0.5, 1.5, 3.0]